@@ -1,12 +1,20 @@
 import os
+import hashlib
+import hmac
 import logging
 import random
 import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta, date
 from functools import wraps
-from typing import List, Optional, Sequence, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, abort, g, make_response, render_template, request, redirect, url_for, flash
+from flask import session as flask_session
 from flask_login import (
     LoginManager,
     UserMixin,
@@ -16,9 +24,11 @@ from flask_login import (
     current_user,
 )
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
 from markupsafe import Markup
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, event, func, insert, inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, undefer
 import click
 from sqlalchemy.orm import load_only
 # =============================================================================
@@ -29,6 +39,27 @@ from sqlalchemy.orm import load_only
 JST = timezone(timedelta(hours=+9), "JST")
 DATETIME_FMT = "%Y/%m/%d %H:%M"
 
+# ボード一覧 / 更新履歴の1ページあたり件数
+BOARDS_PER_PAGE = 50
+HISTORIES_PER_PAGE = 50
+
+# 場所選択の定型候補（これ以外は「その他」として自由入力）
+BOARD_LOCATIONS = ("横浜", "海の公園", "平塚", "日本橋")
+
+# SQLite 接続時に設定する PRAGMA（WAL で読み書きを並行させ、fsync を減らす）
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",
+    "temp_store=MEMORY",
+    "cache_size=-20000",
+    "mmap_size=268435456",
+)
+
+# パスワード照合結果キャッシュ（件数上限 / 有効期限[秒]）
+PASSWORD_CHECK_CACHE_SIZE = 1024
+PASSWORD_CHECK_CACHE_TTL = 300
+
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,21 +73,51 @@ app.config["SECRET_KEY"] = os.environ.get(
 if app.config["SECRET_KEY"] == "a_default_secret_key_for_development":
     logger.warning("SECRET_KEY がデフォルトのままです。本番環境では必ず環境変数で設定してください。")
 
+# 接続プール設定（アイドル切断対策に pre_ping / recycle）
+engine_options: dict = {"pool_recycle": 280, "pool_pre_ping": True}
+
 database_url = os.environ.get("DATABASE_URL")
 if database_url:
     # Heroku 互換
     if database_url.startswith("postgres://"):
         database_url = database_url.replace("postgres://", "postgresql://", 1)
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    if database_url.startswith("postgresql"):
+        engine_options.update(
+            pool_size=10,
+            max_overflow=20,
+            pool_use_lifo=True,
+            # 暴走クエリで接続を占有し続けないよう5秒で打ち切る
+            connect_args={"options": "-c statement_timeout=5000"},
+        )
 else:
     basedir = os.path.abspath(os.path.dirname(__file__))
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(basedir, "boards.db")
 
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_recycle": 280}
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+
+# 本番ではテンプレートの更新チェックをせず、コンパイル結果をワーカー間で共有する
+if not app.debug:
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+    app.jinja_env.auto_reload = False
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
 db = SQLAlchemy(app)
 
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+# 接続プールが接続を作るたびに1回だけ実行される（チェックアウト毎ではない）
+with app.app_context():
+    if db.engine.dialect.name == "sqlite":
+        event.listen(db.engine, "connect", set_sqlite_pragmas)
+
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = "login"
@@ -68,8 +129,20 @@ login_manager.login_message_category = "error"
 # Helpers / Utils
 # =============================================================================
 
-def now_jst_str() -> str:
-    return datetime.now(JST).strftime(DATETIME_FMT)
+def now_jst() -> datetime:
+    return datetime.now(JST)
+
+
+@app.template_filter("format_jst")
+def format_jst(value: Optional[datetime]) -> str:
+    """
+    日時をJSTの表示用文字列に整形する。
+    """
+    if value is None:
+        return ""
+    if value.tzinfo is not None:
+        value = value.astimezone(JST)
+    return value.strftime(DATETIME_FMT)
 
 
 @app.template_filter("nl2br")
@@ -105,6 +178,76 @@ def get_selected_location(form) -> str:
     return form.get("location_other") if location_select == "その他" else (location_select or "")
 
 
+@dataclass(frozen=True, slots=True)
+class BoardForm:
+    """
+    ボード追加 / 更新フォームの入力値。DB に触れる前に一度だけ読み取り・検証する。
+    """
+    name: str
+    serial_number: Optional[str]
+    notes: Optional[str]
+    location: str
+
+    @classmethod
+    def from_form(cls, form) -> "BoardForm":
+        """
+        必須項目（ボード名 / 場所）が欠けていれば ValueError を送出する。
+        """
+        name = form.get("name")
+        location = get_selected_location(form)
+        if not name or not location:
+            raise ValueError("必須項目が入力されていません。")
+        return cls(
+            name=name,
+            serial_number=form.get("serial_number") or None,
+            notes=form.get("notes"),
+            location=location,
+        )
+
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    """
+    ブロック内の書き込みを1つのトランザクションにまとめる。
+    正常終了で commit、例外時は rollback して再送出する。
+    （リクエスト中は load_user の SELECT で既にトランザクションが始まっているため、
+    db.session.begin() は使えない）
+    """
+    try:
+        yield
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+# Board の一意制約名（PostgreSQL）。シリアル番号は旧スキーマの列制約が残っている DB もある
+BOARD_NAME_CONSTRAINTS = {"board_name_key"}
+BOARD_SERIAL_CONSTRAINTS = {"ux_board_serial", "board_serial_number_key"}
+
+
+def board_duplicate_message(error: IntegrityError, name: str, serial_number: Optional[str]) -> str:
+    """
+    Board の一意制約違反（ボード名 / シリアル番号）をユーザー向けメッセージに変換する。
+    違反した制約は PostgreSQL では制約名、SQLite ではエラーメッセージの列名で判別し、
+    それ以外の整合性エラーは汎用メッセージにする。
+    """
+    diag = getattr(error.orig, "diag", None)  # psycopg2
+    if diag is not None:
+        is_name = diag.constraint_name in BOARD_NAME_CONSTRAINTS
+        is_serial = diag.constraint_name in BOARD_SERIAL_CONSTRAINTS
+    else:
+        message = str(error.orig)
+        is_name = message == "UNIQUE constraint failed: board.name"
+        is_serial = message == "UNIQUE constraint failed: board.serial_number"
+
+    if is_serial:
+        return f'シリアル番号「{serial_number}」は既に使用されています。'
+    if is_name:
+        return f'ボード名「{name}」は既に使用されています。'
+    return "ボードを保存できませんでした。入力内容を確認してください。"
+
+
 def validated_order_param(order: Optional[str], default: str = "asc") -> str:
     return order if order in {"asc", "desc"} else default
 
@@ -114,6 +257,67 @@ def validated_sort_by_param(sort_by: Optional[str], default: str = "id") -> str:
     return sort_by if sort_by in {"id", "name"} else default
 
 
+def compute_deploy_version() -> str:
+    """
+    デプロイ単位で変わるバージョン文字列（ETag に混ぜて、デプロイ後に古い HTML を返さないため）。
+    環境変数 DEPLOY_VERSION があればそれを使い、無ければ app.py / テンプレート / 静的ファイルの
+    最終更新時刻から求める（同じファイルを読む全ワーカーで同じ値になる）。
+    """
+    version = os.environ.get("DEPLOY_VERSION")
+    if version:
+        return version
+    paths = [os.path.abspath(__file__)]
+    for folder in (app.template_folder, app.static_folder):
+        if folder:
+            for root, _dirs, files in os.walk(os.path.join(app.root_path, folder)):
+                paths.extend(os.path.join(root, name) for name in files)
+    return str(max(os.stat(path).st_mtime_ns for path in paths))
+
+
+DEPLOY_VERSION = compute_deploy_version()
+
+
+# (保存済みハッシュ, 入力パスワードの HMAC-SHA256) -> (照合結果, 有効期限)
+_password_check_cache: "OrderedDict[Tuple[str, bytes], Tuple[bool, float]]" = OrderedDict()
+_password_check_lock = threading.Lock()
+# キャッシュキー用の HMAC 鍵。プロセス毎に生成し、メモリを読まれてもキーから総当たりできないようにする
+_password_check_secret = os.urandom(32)
+
+
+def cached_check_password_hash(password_hash: str, password: str) -> bool:
+    """
+    check_password_hash の結果を一定時間キャッシュする（ログイン連打時のCPU対策）。
+    キーには入力の HMAC（プロセス毎の鍵）を使い、平文も素のハッシュもメモリに残さない。
+    """
+    from werkzeug.security import check_password_hash
+
+    digest = hmac.new(_password_check_secret, password.encode("utf-8"), hashlib.sha256).digest()
+    key = (password_hash, digest)
+    now = time.monotonic()
+    with _password_check_lock:
+        cached = _password_check_cache.get(key)
+        if cached is not None and cached[1] > now:
+            _password_check_cache.move_to_end(key)
+            return cached[0]
+
+    result = check_password_hash(password_hash, password)
+    with _password_check_lock:
+        _password_check_cache[key] = (result, now + PASSWORD_CHECK_CACHE_TTL)
+        _password_check_cache.move_to_end(key)
+        while len(_password_check_cache) > PASSWORD_CHECK_CACHE_SIZE:
+            _password_check_cache.popitem(last=False)
+    return result
+
+
+def forget_password_hash(password_hash: Optional[str]) -> None:
+    """パスワード変更時に、古いハッシュに紐づくキャッシュを破棄する。"""
+    if not password_hash:
+        return
+    with _password_check_lock:
+        for key in [k for k in _password_check_cache if k[0] == password_hash]:
+            del _password_check_cache[key]
+
+
 # =============================================================================
 # Association Table for Session Members
 # =============================================================================
@@ -146,31 +350,58 @@ class User(UserMixin, db.Model):
 
     def set_password(self, password: str) -> None:
         from werkzeug.security import generate_password_hash
+        forget_password_hash(self.password_hash)
         self.password_hash = generate_password_hash(password)
 
     def check_password(self, password: str) -> bool:
-        from werkzeug.security import check_password_hash
-        return check_password_hash(self.password_hash, password)
+        return cached_check_password_hash(self.password_hash, password)
 
 
 class Board(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
-    serial_number = db.Column(db.String(100), unique=True, nullable=True)
+    serial_number = db.Column(db.String(100), nullable=True)  # 一意性は ux_board_serial で担保
     location = db.Column(db.String(100), nullable=False)
     user = db.Column(db.String(50), nullable=False)
-    updated_at = db.Column(db.String(50), nullable=False)  # 表示依存のため文字列のまま
-    notes = db.Column(db.Text, nullable=True)
-    histories = db.relationship("UpdateHistory", backref="board", lazy=True, cascade="all, delete-orphan")
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=now_jst, onupdate=now_jst)
+    # 長くなりうる備考は既定では読まず、表示する画面で undefer する
+    notes = db.deferred(db.Column(db.Text, nullable=True))
+    # 暗黙の遅延ロード（N+1）を防ぐため、使う箇所で selectinload を明示する。
+    # 一覧や練習詳細でも Board を読むので、既定で eager にはしない
+    histories = db.relationship(
+        "UpdateHistory",
+        back_populates="board",
+        lazy="raise_on_sql",
+        order_by="UpdateHistory.id.desc()",
+        cascade="all, delete-orphan",
+        passive_deletes=True,  # 履歴は delete_board で明示的に DELETE する
+    )
+
+    __table_args__ = (
+        db.Index("ix_board_location", "location"),
+        # シリアル番号は任意入力なので、NULL を除いた部分一意インデックスにする
+        db.Index(
+            "ux_board_serial",
+            "serial_number",
+            unique=True,
+            postgresql_where=db.text("serial_number IS NOT NULL"),
+            sqlite_where=db.text("serial_number IS NOT NULL"),
+        ),
+    )
 
 
 class UpdateHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    board_id = db.Column(db.Integer, db.ForeignKey("board.id"), nullable=False)
+    board_id = db.Column(db.Integer, db.ForeignKey("board.id", ondelete="CASCADE"), nullable=False)
     previous_location = db.Column(db.String(100))
     new_location = db.Column(db.String(100), nullable=False)
     updated_by = db.Column(db.String(50), nullable=False)
-    updated_at = db.Column(db.String(50), nullable=False)  # 表示依存のため文字列のまま
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=now_jst)
+    # 多対一は主キー参照なので、読み込み済みの Board があれば SQL を発行しない
+    board = db.relationship("Board", back_populates="histories", lazy="select")
+
+    # 履歴ページの「board_id で絞り込み + id 降順」をインデックスだけで返せるようにする
+    __table_args__ = (db.Index("ix_history_board_id_id", "board_id", db.text("id DESC")),)
 
 
 class Announcement(db.Model):
@@ -234,7 +465,11 @@ class Transport(db.Model):
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not hasattr(current_user, "role") or current_user.role != "admin":
+        # 判定結果はリクエスト内で使い回す
+        is_admin = getattr(g, "_is_admin", None)
+        if is_admin is None:
+            g._is_admin = is_admin = getattr(current_user, "role", None) == "admin"
+        if not is_admin:
             flash("このページにアクセスするには管理者権限が必要です。", "error")
             return redirect(url_for("dashboard"))
         return f(*args, **kwargs)
@@ -259,32 +494,88 @@ def member_required(f):
 
 @login_manager.user_loader
 def load_user(user_id: str) -> Optional[User]:
-    return User.query.get(int(user_id))
+    # Flask-Login は結果を g._login_user に保持するので、呼ばれるのは1リクエスト1回
+    return db.session.get(User, int(user_id))
 
 
 # =============================================================================
 # Database Initialization
 # =============================================================================
 
+def migrate_legacy_datetime_columns() -> None:
+    """
+    旧スキーマで "YYYY/MM/DD HH:MM"（JST）の文字列として保存していた updated_at を
+    DateTime 列として読める形に変換する。変換済みの DB では何もしない。
+    """
+    dialect = db.engine.dialect.name
+    with db.engine.begin() as conn:
+        for table in (Board.__table__, UpdateHistory.__table__):
+            if dialect == "sqlite":
+                # SQLite は列の型を変えられないので、値を SQLAlchemy の保存形式（JST の壁時計時刻）に書き換える
+                conn.exec_driver_sql(
+                    f"UPDATE {table.name} SET updated_at = replace(updated_at, '/', '-') || ':00.000000' "
+                    "WHERE updated_at GLOB '[0-9][0-9][0-9][0-9]/[0-9][0-9]/[0-9][0-9] [0-9][0-9]:[0-9][0-9]'"
+                )
+            elif dialect == "postgresql":
+                column_types = {c["name"]: c["type"] for c in inspect(conn).get_columns(table.name)}
+                if not isinstance(column_types["updated_at"], db.DateTime):
+                    # 表全体の書き換えになるため、このトランザクションだけ statement_timeout を外す
+                    conn.exec_driver_sql("SET LOCAL statement_timeout = 0")
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ALTER COLUMN updated_at TYPE timestamptz "
+                        "USING to_timestamp(updated_at, 'YYYY/MM/DD HH24:MI')::timestamp AT TIME ZONE 'Asia/Tokyo'"
+                    )
+
+
+def init_db() -> None:
+    """
+    テーブル作成に加えて、旧データの移行と、既存テーブルに不足しているインデックスの作成を行う。
+    （create_all は既存テーブルへのインデックス追加を行わないため）
+    `flask init-db` から1回だけ実行し、ワーカーの起動時には実行しない。
+    """
+    db.create_all()
+    migrate_legacy_datetime_columns()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+    # SQLite はプランナ用の統計（sqlite_stat1）を自動更新しないのでここで集計する
+    if db.engine.dialect.name == "sqlite":
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+
+# import 時（gunicorn の各ワーカー起動時）は不足テーブルの作成だけを行う
 with app.app_context():
     db.create_all()
 
+# 最初のリクエストでテンプレートのコンパイル待ちが発生しないよう事前に読み込む
+if not app.debug:
+    for template_name in app.jinja_env.list_templates(extensions=["html"]):
+        app.jinja_env.get_template(template_name)
+
 
 # =============================================================================
-# CLI Command for Admin Promotion
+# CLI Commands
 # =============================================================================
 
+@app.cli.command("init-db")
+def init_db_command():
+    init_db()
+    print("データベースを初期化しました。")
+
+
 @app.cli.command("promote-admin")
 @click.argument("username")
 def promote_admin_command(username: str):
-    with app.app_context():
-        user = User.query.filter_by(username=username).first()
-        if user:
-            user.role = "admin"
-            db.session.commit()
-            print(f"ユーザー '{username}' は管理者に昇格しました。")
-        else:
-            print(f"ユーザー '{username}' が見つかりません。")
+    # flask CLI のコマンドは app context 内で実行される
+    user = User.query.filter_by(username=username).first()
+    if user:
+        user.role = "admin"
+        db.session.commit()
+        print(f"ユーザー '{username}' は管理者に昇格しました。")
+    else:
+        print(f"ユーザー '{username}' が見つかりません。")
 
 
 # =============================================================================
@@ -425,23 +716,83 @@ def profile():
 def board_index():
     sort_by = validated_sort_by_param(request.args.get("sort_by"), "id")
     order = validated_order_param(request.args.get("order"), "asc")
+    page = max(request.args.get("page", 1, type=int), 1)
+    reverse = order == "desc"
 
-    # すべてのボードを取得
-    boards: List[Board] = Board.query.all()
+    # ロケーション件数集計（SQL側で GROUP BY）
+    location_counts: dict[str, int] = dict(
+        db.session.query(Board.location, func.count(Board.id))
+        .group_by(Board.location)
+        .order_by(Board.location)
+        .all()
+    )
 
-    # ソート
-    reverse = order == "desc"
+    # ページ数（総件数は集計結果から求める）
+    total = sum(location_counts.values())
+    pages = max(1, -(-total // BOARDS_PER_PAGE))
+    page = min(page, pages)
+    offset = (page - 1) * BOARDS_PER_PAGE
+
+    # 一覧が前回から変わっていなければ、ボードの取得と描画を省略して 304 を返す。
+    # 画面はログインユーザーとフラッシュメッセージにも依存するので、それらも考慮する
+    etag = None
+    if "_flashes" not in flask_session:
+        max_id, last_updated_at = db.session.query(func.max(Board.id), func.max(Board.updated_at)).one()
+        state = (
+            DEPLOY_VERSION,
+            current_user.id,
+            current_user.username,
+            current_user.role,
+            sorted(location_counts.items()),
+            max_id,
+            last_updated_at,
+            sort_by,
+            order,
+            page,
+        )
+        etag = hashlib.sha1(repr(state).encode("utf-8")).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+    boards: List[Board]
     if sort_by == "name":
-        boards = sorted(boards, key=lambda b: natural_sort_key(b.name), reverse=reverse)
+        # 自然順は SQL で表せないため、id と名前だけで並べ替えてから表示ページ分を取得する
+        names = db.session.query(Board.id, Board.name).all()
+        names.sort(key=lambda r: natural_sort_key(r.name), reverse=reverse)
+        page_ids = [r.id for r in names[offset:offset + BOARDS_PER_PAGE]]
+        boards_by_id = {
+            b.id: b for b in Board.query.options(undefer(Board.notes)).filter(Board.id.in_(page_ids)).all()
+        }
+        boards = [boards_by_id[bid] for bid in page_ids if bid in boards_by_id]
     else:
-        boards = sorted(boards, key=lambda b: b.id, reverse=reverse)
-
-    # ロケーション件数集計
-    location_counts: dict[str, int] = {}
-    for b in boards:
-        location_counts[b.location] = location_counts.get(b.location, 0) + 1
+        id_order = Board.id.desc() if reverse else Board.id.asc()
+        boards = (
+            Board.query.options(undefer(Board.notes))
+            .order_by(id_order)
+            .offset(offset)
+            .limit(BOARDS_PER_PAGE)
+            .all()
+        )
 
-    return render_template("boards/index.html", boards=boards, location_counts=location_counts)
+    response = make_response(
+        render_template(
+            "boards/index.html",
+            boards=boards,
+            location_counts=location_counts,
+            sort_by=sort_by,
+            locations=BOARD_LOCATIONS,
+            order=order,
+            page=page,
+            pages=pages,
+        )
+    )
+    if etag:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @app.route("/boards/add", methods=["GET", "POST"])
@@ -449,109 +800,151 @@ def board_index():
 @member_required
 def add_board():
     if request.method == "POST":
-        name = request.form.get("name")
-        serial_number = (request.form.get("serial_number") or None) or None
-        notes = request.form.get("notes")
-        location = get_selected_location(request.form)
-        user = current_user.username
-
-        if not all([name, location]):
-            flash("必須項目が入力されていません。", "error")
-            return redirect(url_for("add_board"))
-
-        if Board.query.filter_by(name=name).first():
-            flash(f'ボード名「{name}」は既に使用されています。', "error")
-            return redirect(url_for("add_board"))
-
-        if serial_number and Board.query.filter_by(serial_number=serial_number).first():
-            flash(f'シリアル番号「{serial_number}」は既に使用されています。', "error")
+        try:
+            form = BoardForm.from_form(request.form)
+        except ValueError as e:
+            flash(str(e), "error")
             return redirect(url_for("add_board"))
 
         new_board = Board(
-            name=name,
-            serial_number=serial_number,
-            location=location,
-            user=user,
-            notes=notes,
-            updated_at=now_jst_str(),
+            name=form.name,
+            serial_number=form.serial_number,
+            location=form.location,
+            user=current_user.username,
+            notes=form.notes,
         )
-        db.session.add(new_board)
-        db.session.commit()
-        flash(f'ボード「{name}」が正常に追加されました。', "success")
+        # 重複チェックは事前の SELECT ではなく一意制約に任せる
+        try:
+            with transaction():
+                db.session.add(new_board)
+        except IntegrityError as e:
+            flash(board_duplicate_message(e, form.name, form.serial_number), "error")
+            return redirect(url_for("add_board"))
+        flash(f'ボード「{form.name}」が正常に追加されました。', "success")
         return redirect(url_for("board_index"))
-    return render_template("boards/add.html")
+    return render_template("boards/add.html", locations=BOARD_LOCATIONS)
 
 
 @app.route("/boards/update/<int:board_id>", methods=["GET", "POST"])
 @login_required
 @member_required
 def update_board(board_id: int):
-    board_to_update = Board.query.get_or_404(board_id)
+    board_to_update = db.session.get(Board, board_id, options=[undefer(Board.notes)]) or abort(404)
     if request.method == "POST":
         previous_location = board_to_update.location
         previous_user = board_to_update.user
 
-        new_name = request.form.get("name")
-        new_serial_number = (request.form.get("serial_number") or None) or None
-        notes = request.form.get("notes")
-        new_location = get_selected_location(request.form)
-        new_user = current_user.username
-
-        if not all([new_name, new_location]):
-            flash("必須項目が入力されていません。", "error")
+        try:
+            form = BoardForm.from_form(request.form)
+        except ValueError as e:
+            flash(str(e), "error")
             return redirect(url_for("update_board", board_id=board_id))
+        new_location = form.location
+        new_user = current_user.username
 
-        if Board.query.filter(Board.name == new_name, Board.id != board_id).first():
-            flash(f'ボード名「{new_name}」は既に使用されています。', "error")
-            return redirect(url_for("update_board", board_id=board_id))
+        # 何も変わっていなければ書き込みを行わない
+        unchanged = (
+            form.name == board_to_update.name
+            and form.serial_number == board_to_update.serial_number
+            and (form.notes or "") == (board_to_update.notes or "")
+            and new_location == previous_location
+            and new_user == previous_user
+        )
+        if unchanged:
+            flash("変更はありませんでした。", "info")
+            return redirect(url_for("board_index"))
 
-        if new_serial_number and Board.query.filter(
-            Board.serial_number == new_serial_number, Board.id != board_id
-        ).first():
-            flash(f'シリアル番号「{new_serial_number}」は既に使用されています。', "error")
+        current_time_jst = now_jst()
+        try:
+            with transaction():
+                if previous_location != new_location or previous_user != new_user:
+                    history_entry = UpdateHistory(
+                        board_id=board_id,
+                        previous_location=previous_location,
+                        new_location=new_location,
+                        updated_by=new_user,
+                        updated_at=current_time_jst,
+                    )
+                    db.session.add(history_entry)
+
+                board_to_update.name = form.name
+                board_to_update.serial_number = form.serial_number
+                board_to_update.notes = form.notes
+                board_to_update.location = new_location
+                board_to_update.user = new_user
+                board_to_update.updated_at = current_time_jst
+        except IntegrityError as e:
+            flash(board_duplicate_message(e, form.name, form.serial_number), "error")
             return redirect(url_for("update_board", board_id=board_id))
-
-        current_time_jst = now_jst_str()
-        if previous_location != new_location or previous_user != new_user:
-            history_entry = UpdateHistory(
-                board_id=board_id,
-                previous_location=previous_location,
-                new_location=new_location,
-                updated_by=new_user,
-                updated_at=current_time_jst,
-            )
-            db.session.add(history_entry)
-
-        board_to_update.name = new_name
-        board_to_update.serial_number = new_serial_number
-        board_to_update.notes = notes
-        board_to_update.location = new_location
-        board_to_update.user = new_user
-        board_to_update.updated_at = current_time_jst
-
-        db.session.commit()
-        flash(f'ボード「{board_to_update.name}」が正常に更新されました。', "success")
+        flash(f'ボード「{form.name}」が正常に更新されました。', "success")
         return redirect(url_for("board_index"))
-    return render_template("boards/update.html", board=board_to_update)
+    return render_template(
+        "boards/update.html", board=board_to_update, locations=BOARD_LOCATIONS
+    )
 
 
 @app.route("/boards/delete/<int:board_id>", methods=["POST"])
 @login_required
 @member_required
 def delete_board(board_id: int):
-    board_to_delete = Board.query.get_or_404(board_id)
-    db.session.delete(board_to_delete)
-    db.session.commit()
-    flash(f'ボード「{board_to_delete.name}」を削除しました。', "success")
+    # ボードも履歴も読み込まずに DELETE する。
+    # 既存 DB の FK には ON DELETE CASCADE が無いため、履歴は先に明示的に消す
+    try:
+        with transaction():
+            db.session.execute(
+                delete(UpdateHistory)
+                .where(UpdateHistory.board_id == board_id)
+                .execution_options(synchronize_session=False)
+            )
+            delete_stmt = (
+                delete(Board)
+                .where(Board.id == board_id)
+                .execution_options(synchronize_session=False)
+            )
+            if db.engine.dialect.delete_returning:
+                board_name = db.session.execute(delete_stmt.returning(Board.name)).scalar_one_or_none()
+            else:
+                # DELETE ... RETURNING 非対応（SQLite 3.35 未満）の場合は名前だけ先に読む
+                board = db.session.get(Board, board_id, options=[load_only(Board.name)])
+                board_name = board.name if board is not None else None
+                if board is not None:
+                    db.session.execute(delete_stmt)
+    except IntegrityError:
+        flash("運搬情報などの関連データが残っているため、このボードは削除できません。", "error")
+        return redirect(url_for("board_index"))
+    if board_name is None:
+        abort(404)
+    flash(f'ボード「{board_name}」を削除しました。', "success")
     return redirect(url_for("board_index"))
 
 
 @app.route("/boards/history/<int:board_id>")
 @login_required
 def history(board_id: int):
-    board = Board.query.get_or_404(board_id)
-    histories = UpdateHistory.query.filter_by(board_id=board.id).order_by(UpdateHistory.id.desc()).all()
-    return render_template("boards/history.html", board=board, histories=histories)
+    board = db.get_or_404(Board, board_id)
+    page = max(request.args.get("page", 1, type=int), 1)
+
+    # 表示する列だけを1ページ分 + 1件取得し、余った1件で次ページの有無を判定する
+    rows = (
+        db.session.query(
+            UpdateHistory.previous_location,
+            UpdateHistory.new_location,
+            UpdateHistory.updated_by,
+            UpdateHistory.updated_at,
+        )
+        .filter(UpdateHistory.board_id == board.id)
+        .order_by(UpdateHistory.id.desc())
+        .offset((page - 1) * HISTORIES_PER_PAGE)
+        .limit(HISTORIES_PER_PAGE + 1)
+        .all()
+    )
+    return render_template(
+        "boards/history.html",
+        board=board,
+        histories=rows[:HISTORIES_PER_PAGE],
+        page=page,
+        has_next=len(rows) > HISTORIES_PER_PAGE,
+    )
 
 
 @app.route("/boards/bulk_update", methods=["POST"])
@@ -559,7 +952,12 @@ def history(board_id: int):
 @member_required
 def bulk_update():
     board_ids_raw = request.form.getlist("board_ids")
-    board_ids = [to_int_or_none(bid) for bid in board_ids_raw if to_int_or_none(bid) is not None]
+    # SQL に渡す前に一度だけ整数化し、重複も除く
+    try:
+        board_ids = sorted({int(bid) for bid in board_ids_raw})
+    except ValueError:
+        logger.warning("bulk_update: 不正な board_ids を拒否しました: %r", board_ids_raw)
+        abort(400)
 
     if not board_ids:
         flash("更新するボードが選択されていません。", "error")
@@ -567,35 +965,42 @@ def bulk_update():
 
     updater = current_user.username
     new_location = get_selected_location(request.form)
-    current_time_jst = now_jst_str()
-
-    updated_count = 0
-    for board_id in board_ids:
-        board = Board.query.get(board_id)
-        if not board:
-            continue
-
-        previous_location = board.location
-        previous_user = board.user
-
-        if previous_location != new_location or previous_user != updater:
-            history_entry = UpdateHistory(
-                board_id=board.id,
-                previous_location=previous_location,
-                new_location=new_location,
-                updated_by=updater,
-                updated_at=current_time_jst,
-            )
-            db.session.add(history_entry)
+    current_time_jst = now_jst()
 
-        board.location = new_location
-        board.user = updater
-        board.updated_at = current_time_jst
-        updated_count += 1
+    # 1件ずつ get すると N+1 になるため、IN 句でまとめて取得する
+    # 判定に使うのは id / 場所 / 更新者だけ
+    boards = (
+        Board.query.options(load_only(Board.id, Board.location, Board.user))
+        .filter(Board.id.in_(board_ids))
+        .all()
+    )
+    if not boards:
+        return redirect(url_for("board_index"))
 
-    if updated_count > 0:
-        db.session.commit()
-        flash(f"{updated_count}件のボード情報を一括更新しました。", "success")
+    # 場所か更新者が変わるボードだけ履歴を残す
+    history_rows = [
+        {
+            "board_id": b.id,
+            "previous_location": b.location,
+            "new_location": new_location,
+            "updated_by": updater,
+            "updated_at": current_time_jst,
+        }
+        for b in boards
+        if b.location != new_location or b.user != updater
+    ]
+
+    # 行ごとの INSERT/UPDATE ではなく、複数行 INSERT と 1 本の UPDATE で書き込む
+    with transaction():
+        if history_rows:
+            db.session.execute(insert(UpdateHistory), history_rows)
+        db.session.execute(
+            update(Board)
+            .where(Board.id.in_([b.id for b in boards]))
+            .values(location=new_location, user=updater, updated_at=current_time_jst)
+            .execution_options(synchronize_session=False)
+        )
+    flash(f"{len(boards)}件のボード情報を一括更新しました。", "success")
     return redirect(url_for("board_index"))
 
 
@@ -631,7 +1036,7 @@ def create_practice():
             return redirect(url_for("create_practice"))
 
         # チーム存在確認
-        team = Team.query.get(team_id)
+        team = db.session.get(Team, team_id)
         if not team:
             flash("選択されたチームが見つかりませんでした。", "error")
             return redirect(url_for("create_practice"))
@@ -700,12 +1105,13 @@ def practice_detail(practice_id: int):
     transports_to = Transport.query.filter_by(practice_id=practice.id, direction="to").all()
     transports_from = Transport.query.filter_by(practice_id=practice.id, direction="from").all()
 
-    # ボード一覧（自然順）
-    all_boards = Board.query.all()
+    # ボード一覧（自然順）。画面で使うのは id / 名前 / 場所だけなので notes 等は読まない
+    board_columns = load_only(Board.id, Board.name, Board.location)
+    all_boards = Board.query.options(board_columns).all()
     all_boards = sorted(all_boards, key=lambda b: natural_sort_key(b.name))
 
     transported_to_board_ids = [t.board_id for t in transports_to]
-    boards_at_practice = Board.query.filter(
+    boards_at_practice = Board.query.options(board_columns).filter(
         (Board.location == practice.location) | (Board.id.in_(transported_to_board_ids))
     ).all()
 
@@ -731,7 +1137,7 @@ def practice_detail(practice_id: int):
 @login_required
 @member_required
 def answer_attendance(attendance_id: int):
-    attendance = Attendance.query.get_or_404(attendance_id)
+    attendance = db.get_or_404(Attendance, attendance_id)
     if attendance.user_id != current_user.id:
         flash("権限がありません。", "error")
         return redirect(url_for("practice_index"))
@@ -748,7 +1154,7 @@ def answer_attendance(attendance_id: int):
 @login_required
 @admin_required
 def add_session(practice_id: int):
-    practice = Practice.query.get_or_404(practice_id)
+    practice = db.get_or_404(Practice, practice_id)
     session_count = len(practice.sessions)
     new_session = PracticeSession(practice_id=practice.id, session_number=session_count + 1)
     db.session.add(new_session)
@@ -777,7 +1183,7 @@ def assign_member():
         flash("セッションが見つかりません。", "error")
         return redirect(url_for("practice_detail", practice_id=practice_id, _anchor="session-management"))
 
-    session = PracticeSession.query.get(session_id)
+    session = db.session.get(PracticeSession, session_id)
     if not session:
         flash("セッションが見つかりません。", "error")
         return redirect(url_for("practice_detail", practice_id=practice_id, _anchor="session-management"))
@@ -788,7 +1194,7 @@ def assign_member():
     assigned_count = 0
     assigned_usernames: List[str] = []
     for user_id in user_ids:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if user and user not in session.members:
             session.members.append(user)
             assigned_count += 1
@@ -806,8 +1212,8 @@ def assign_member():
 @login_required
 @admin_required
 def unassign_member(session_id: int, user_id: int):
-    session = PracticeSession.query.get_or_404(session_id)
-    user = User.query.get_or_404(user_id)
+    session = db.get_or_404(PracticeSession, session_id)
+    user = db.get_or_404(User, user_id)
     if user in session.members:
         session.members.remove(user)
         db.session.commit()
@@ -819,7 +1225,7 @@ def unassign_member(session_id: int, user_id: int):
 @login_required
 @admin_required
 def delete_session(session_id: int):
-    session_to_delete = PracticeSession.query.get_or_404(session_id)
+    session_to_delete = db.get_or_404(PracticeSession, session_id)
     practice_id = session_to_delete.practice_id
     db.session.delete(session_to_delete)
     db.session.commit()
@@ -831,7 +1237,7 @@ def delete_session(session_id: int):
 @login_required
 @admin_required
 def delete_practice(practice_id: int):
-    practice_to_delete = Practice.query.get_or_404(practice_id)
+    practice_to_delete = db.get_or_404(Practice, practice_id)
     db.session.delete(practice_to_delete)
     db.session.commit()
     flash(f'練習「{practice_to_delete.title}」を削除しました。', "success")
@@ -858,7 +1264,7 @@ def assign_transport():
         flash("運搬者とボードを選択してください。", "error")
         return redirect(url_for("practice_detail", practice_id=practice_id, _anchor="transport-planning"))
 
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         flash("ユーザーが見つかりません。", "error")
         return redirect(url_for("practice_detail", practice_id=practice_id, _anchor="transport-planning"))
@@ -869,7 +1275,7 @@ def assign_transport():
         ).first()
         if existing:
             # 上書き処理
-            old_user = User.query.get(existing.user_id)
+            old_user = db.session.get(User, existing.user_id)
             if old_user and old_user.id != user_id:
                 old_user.transport_count = max(0, old_user.transport_count - 1)
                 user.transport_count += 1
@@ -889,9 +1295,9 @@ def assign_transport():
 @login_required
 @admin_required
 def unassign_transport(transport_id: int):
-    transport_to_delete = Transport.query.get_or_404(transport_id)
+    transport_to_delete = db.get_or_404(Transport, transport_id)
     practice_id = transport_to_delete.practice_id
-    user = User.query.get(transport_to_delete.user_id)
+    user = db.session.get(User, transport_to_delete.user_id)
     if user:
         user.transport_count = max(0, user.transport_count - 1)
     db.session.delete(transport_to_delete)
@@ -904,7 +1310,7 @@ def unassign_transport(transport_id: int):
 @login_required
 @admin_required
 def run_lottery(practice_id: int):
-    practice = Practice.query.get_or_404(practice_id)
+    practice = db.get_or_404(Practice, practice_id)
     board_ids_for_lottery_raw = request.form.getlist("board_ids_for_lottery")
     board_ids_for_lottery = [to_int_or_none(bid) for bid in board_ids_for_lottery_raw]
     board_ids_for_lottery = [bid for bid in board_ids_for_lottery if bid is not None]
@@ -1005,7 +1411,7 @@ def admin_teams():
 @login_required
 @admin_required
 def delete_team(team_id: int):
-    team_to_delete = Team.query.get_or_404(team_id)
+    team_to_delete = db.get_or_404(Team, team_id)
     if team_to_delete.users:
         flash("所属しているユーザーがいるため、このチームは削除できません。", "error")
     else:
@@ -1019,15 +1425,23 @@ def delete_team(team_id: int):
 @login_required
 @admin_required
 def admin_users():
-    users = User.query.all()
-    return render_template("admin/users.html", users=users)
+    # ユーザーごとの最終更新ボード数も1クエリで集計する（チームは selectinload）
+    users_with_board_counts: List[Tuple[User, int]] = (
+        db.session.query(User, func.count(Board.id))
+        .outerjoin(Board, Board.user == User.username)
+        .options(selectinload(User.team))
+        .group_by(User.id)
+        .order_by(User.id)
+        .all()
+    )
+    return render_template("admin/users.html", users_with_board_counts=users_with_board_counts)
 
 
 @app.route("/admin/users/promote/<int:user_id>", methods=["POST"])
 @login_required
 @admin_required
 def promote_user(user_id: int):
-    user_to_promote = User.query.get_or_404(user_id)
+    user_to_promote = db.get_or_404(User, user_id)
     user_to_promote.role = "admin"
     db.session.commit()
     flash(f"ユーザー '{user_to_promote.username}' は管理者に昇格しました。", "success")
@@ -1041,7 +1455,7 @@ def demote_user(user_id: int):
     if current_user.id == user_id:
         flash("自分自身を降格させることはできません。", "error")
         return redirect(url_for("admin_users"))
-    user_to_demote = User.query.get_or_404(user_id)
+    user_to_demote = db.get_or_404(User, user_id)
     user_to_demote.role = "member"
     db.session.commit()
     flash(f"ユーザー '{user_to_demote.username}' は一般ユーザーに降格しました。", "success")
@@ -1056,7 +1470,7 @@ def delete_user(user_id: int):
         flash("自分自身を削除することはできません。", "error")
         return redirect(url_for("admin_users"))
 
-    user_to_delete = User.query.get_or_404(user_id)
+    user_to_delete = db.get_or_404(User, user_id)
 
     # 関連する子レコードを先に削除
     Announcement.query.filter_by(user_id=user_id).delete(synchronize_session=False)
@@ -1106,7 +1520,7 @@ def new_announcement():
 @login_required
 @admin_required
 def delete_announcement(announcement_id: int):
-    announcement_to_delete = Announcement.query.get_or_404(announcement_id)
+    announcement_to_delete = db.get_or_404(Announcement, announcement_id)
     db.session.delete(announcement_to_delete)
     db.session.commit()
     flash("お知らせを削除しました。", "success")